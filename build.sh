@@ -9,7 +9,8 @@ if [[ "$1" == "--distribute" ]]; then
     maturin build --release
     echo "Wheel built successfully"
 else
-    # Build for development
-    maturin develop --release -v
+    # Build for development, tuned for this machine's CPU unless RUSTFLAGS is set.
+    # Distribution wheels above keep the portable default target.
+    RUSTFLAGS="${RUSTFLAGS:--C target-cpu=native}" maturin develop --release -v
     echo "oxidize-xml built successfully"
 fi
\ No newline at end of file
@@ -3,8 +3,28 @@
 //! Provides structured error types with detailed context for different failure scenarios.
 
 use pyo3::prelude::*;
+use pyo3::PyErrArguments;
+use pyo3::types::PyString;
+use std::borrow::Cow;
+use std::cell::RefCell;
+use std::fmt::Write;
 use pyo3::exceptions::{PyValueError, PyIOError, PyRuntimeError};
 
+// Longest piece of user-supplied text (paths, parser messages echoing XML) put in a message
+const MAX_EMBEDDED_TEXT_LEN: usize = 256;
+
+/// Truncate user-supplied text embedded in an error message, on a UTF-8 character boundary
+fn truncate_embedded(s: &str) -> Cow<'_, str> {
+    if s.len() <= MAX_EMBEDDED_TEXT_LEN {
+        return Cow::Borrowed(s);
+    }
+    let mut end = MAX_EMBEDDED_TEXT_LEN;
+    while !s.is_char_boundary(end) {
+        end -= 1;
+    }
+    Cow::Owned(format!("{}…[truncated {} bytes]", &s[..end], s.len() - end))
+}
+
 /// Structured error types for better error handling
 #[derive(Debug)]
 pub enum OxidizeError {
@@ -22,12 +42,12 @@ impl std::fmt::Display for OxidizeError {
                 write!(f, "Invalid input: {} (context: {})", message, context)
             }
             OxidizeError::FileError { path, error } => {
-                write!(f, "File error for '{}': {}", path, error)
+                write!(f, "File error for '{}': {}", truncate_embedded(path), truncate_embedded(error))
             }
             OxidizeError::XmlParseError { position, message } => {
                 match position {
-                    Some(pos) => write!(f, "XML parsing error at position {}: {}", pos, message),
-                    None => write!(f, "XML parsing error: {}", message),
+                    Some(pos) => write!(f, "XML parsing error at position {}: {}", pos, truncate_embedded(message)),
+                    None => write!(f, "XML parsing error: {}", truncate_embedded(message)),
                 }
             }
             OxidizeError::MemoryError { message } => {
@@ -42,14 +62,61 @@ impl std::fmt::Display for OxidizeError {
 
 impl std::error::Error for OxidizeError {}
 
+thread_local! {
+    // Scratch buffer for exception messages; PyString::new copies out of it
+    static MESSAGE_BUFFER: RefCell<String> = RefCell::new(String::with_capacity(256));
+}
+
+/// The error itself is the exception argument, so the message is only formatted
+/// if Python actually materializes the exception
+impl PyErrArguments for OxidizeError {
+    fn arguments(self, py: Python<'_>) -> PyObject {
+        MESSAGE_BUFFER.with(|buffer| {
+            let mut buffer = buffer.borrow_mut();
+            buffer.clear();
+            write!(buffer, "{}", self).expect("formatting into a String cannot fail");
+            PyString::new(py, &buffer).into_any().unbind()
+        })
+    }
+}
+
 impl From<OxidizeError> for PyErr {
     fn from(err: OxidizeError) -> Self {
+        // Builtin exception types are static PyExc_* objects, so no lookup happens here
         match err {
-            OxidizeError::InvalidInput { .. } => PyValueError::new_err(err.to_string()),
-            OxidizeError::FileError { .. } => PyIOError::new_err(err.to_string()),
-            OxidizeError::XmlParseError { .. } => PyValueError::new_err(err.to_string()),
-            OxidizeError::MemoryError { .. } => PyRuntimeError::new_err(err.to_string()),
-            OxidizeError::IoError { .. } => PyIOError::new_err(err.to_string()),
+            OxidizeError::InvalidInput { .. } => PyValueError::new_err(err),
+            OxidizeError::FileError { .. } => PyIOError::new_err(err),
+            OxidizeError::XmlParseError { .. } => PyValueError::new_err(err),
+            OxidizeError::MemoryError { .. } => PyRuntimeError::new_err(err),
+            OxidizeError::IoError { .. } => PyIOError::new_err(err),
         }
     }
-}
\ No newline at end of file
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_short_text_not_truncated() {
+        assert!(matches!(truncate_embedded("/tmp/input.xml"), Cow::Borrowed("/tmp/input.xml")));
+    }
+
+    #[test]
+    fn test_long_text_truncated_on_char_boundary() {
+        let text = "é".repeat(MAX_EMBEDDED_TEXT_LEN);
+        let truncated = truncate_embedded(&text);
+        assert!(truncated.len() < text.len());
+        assert!(truncated.starts_with("éé"));
+        assert!(truncated.ends_with(&format!("[truncated {} bytes]", text.len() - MAX_EMBEDDED_TEXT_LEN)));
+    }
+
+    #[test]
+    fn test_parse_error_message_bounded() {
+        let err = OxidizeError::XmlParseError {
+            position: Some(7),
+            message: "x".repeat(1 << 20),
+        };
+        assert!(err.to_string().len() < 2 * MAX_EMBEDDED_TEXT_LEN);
+    }
+}
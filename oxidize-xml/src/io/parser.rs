@@ -6,15 +6,18 @@
 use quick_xml::Reader;
 use quick_xml::events::Event;
 use std::io::{BufRead, Write};
-use std::collections::VecDeque;
 use std::path::PathBuf;
+use std::sync::mpsc::{self, Receiver, SyncSender};
 use rayon::prelude::*;
-use crate::io::xml_utils::get_xml_node;
+use crate::io::xml_utils::{get_xml_node, into_utf8_string};
 use crate::io::error::OxidizeError;
 
 // Constants for magic numbers
 pub const DEFAULT_BATCH_SIZE: usize = 1000;
 const MAX_BATCH_SIZE: usize = 1_000_000;
+const EVENT_BUFFER_CAPACITY: usize = 8192;  // Initial size of the reused event buffer
+const MAX_OUTPUT_CHUNK_RECORDS: usize = 64;  // Most records serialized into one parallel output buffer
+const OUTPUT_CHUNKS_PER_THREAD: usize = 4;   // Parallel output buffers per worker, for load balancing
 
 // Security limits to prevent XML bomb attacks
 const MAX_ELEMENT_DEPTH: usize = 1000;        // Maximum nesting depth
@@ -22,34 +25,29 @@ const MAX_ELEMENT_SIZE: usize = 10_000_000;   // Maximum element size (10MB)
 const MAX_ATTRIBUTE_COUNT: usize = 1000;      // Maximum attributes per element
 const MAX_ATTRIBUTE_SIZE: usize = 65536;      // Maximum attribute value size (64KB)
 
-// Helper function to write tag with attributes to a buffer
-fn write_tag_with_attributes(buf: &mut Vec<u8>, e: &quick_xml::events::BytesStart, self_closing: bool) {
-    buf.extend_from_slice(b"<");
-    buf.extend_from_slice(e.name().as_ref());
-    for attr in e.attributes() {
-        if let Ok(attr) = attr {
-            buf.extend_from_slice(b" ");
-            buf.extend_from_slice(attr.key.as_ref());
-            buf.extend_from_slice(b"=\"");
-            buf.extend_from_slice(&attr.value);
-            buf.extend_from_slice(b"\"");
-        }
-    }
+// Helper function to copy a start tag to a buffer verbatim
+//
+// quick_xml has already located the tag's `<`/`>` with its memchr (SIMD) scan, and the event
+// holds the raw bytes in between, so the name and attributes are copied in one go instead of
+// being re-tokenized attribute by attribute.
+fn write_tag(buf: &mut Vec<u8>, e: &quick_xml::events::BytesStart, self_closing: bool) {
+    buf.push(b'<');
+    buf.extend_from_slice(e);
     if self_closing {
         buf.extend_from_slice(b"/>");
     } else {
-        buf.extend_from_slice(b">");
+        buf.push(b'>');
     }
 }
 
 // Helper function to write opening tag with attributes to a buffer
 fn write_opening_tag(buf: &mut Vec<u8>, e: &quick_xml::events::BytesStart) {
-    write_tag_with_attributes(buf, e, false);
+    write_tag(buf, e, false);
 }
 
 // Helper function to write self-closing tag with attributes to a buffer
 fn write_self_closing_tag(buf: &mut Vec<u8>, e: &quick_xml::events::BytesStart) {
-    write_tag_with_attributes(buf, e, true);
+    write_tag(buf, e, true);
 }
 
 // Helper function to write closing tag to a buffer
@@ -59,10 +57,32 @@ fn write_closing_tag(buf: &mut Vec<u8>, e: &quick_xml::events::BytesEnd) {
     buf.extend_from_slice(b">");
 }
 
+/// Target element name, specialized on its length `N` when short (`N == 0`: any length)
+///
+/// quick_xml has already cut the name out of the tag, so matching is an exact comparison of
+/// two short slices, not a substring search. With `N` fixed at compile time, the length check
+/// rejects most names and the byte comparison becomes a couple of integer loads instead of a
+/// `memcmp` call.
+#[derive(Clone, Copy)]
+struct TargetName<'a, const N: usize> {
+    bytes: &'a [u8],
+}
+
+impl<const N: usize> TargetName<'_, N> {
+    #[inline]
+    fn matches(&self, name: quick_xml::name::QName<'_>) -> bool {
+        let name = name.as_ref();
+        if N == 0 {
+            return name == self.bytes;
+        }
+        name.len() == N && name[..N] == self.bytes[..N]
+    }
+}
+
 /// Hybrid streaming parser that uses quick_xml for streaming and parallel processing for batches
 pub struct HybridStreamParser {
     batch_size: usize,
-    element_queue: VecDeque<String>,
+    element_queue: Vec<String>,
     // Reusable buffer to reduce allocations
     temp_buffer: Vec<u8>,
     // Security tracking
@@ -74,7 +94,7 @@ impl HybridStreamParser {
     pub fn new(batch_size: usize) -> Self {
         Self {
             batch_size,
-            element_queue: VecDeque::new(),
+            element_queue: Vec::new(),
             temp_buffer: Vec::new(), // Start small, grow naturally
             current_depth: 0,
             max_depth_reached: 0,
@@ -83,7 +103,7 @@ impl HybridStreamParser {
 
     /// Add a complete element to the queue
     fn queue_element(&mut self, element_xml: String) {
-        self.element_queue.push_back(element_xml);
+        self.element_queue.push(element_xml);
     }
     
     /// Create and queue a self-closing element using reusable buffer
@@ -102,10 +122,13 @@ impl HybridStreamParser {
             });
         }
         
-        // Use mem::take to avoid clone - takes ownership of buffer contents
-        if let Ok(element_str) = String::from_utf8(std::mem::take(&mut self.temp_buffer)) {
+        // Use mem::take to avoid clone - takes ownership of buffer contents, then
+        // re-reserve the same size so the next element does not regrow from empty
+        let element_len = self.temp_buffer.len();
+        if let Ok(element_str) = into_utf8_string(std::mem::take(&mut self.temp_buffer)) {
             self.queue_element(element_str);
         }
+        self.temp_buffer.reserve(element_len);
         
         Ok(())
     }
@@ -160,68 +183,28 @@ impl HybridStreamParser {
         Ok(())
     }
 
-    /// Process batch if queue is full and write results
-    pub fn process_batch_if_full<W: Write>(&mut self, writer: &mut W, total_count: &mut usize) -> Result<(), OxidizeError> {
+    /// Hand the queued elements to the output thread once a full batch has been collected
+    pub fn send_batch_if_full(&mut self, batches: &SyncSender<Vec<String>>) -> Result<(), OxidizeError> {
         if self.element_queue.len() >= self.batch_size {
-            let results = self.process_batch();
-            *total_count += results.len();
-
-            // Write results
-            for json_line in results {
-                writeln!(writer, "{}", json_line)
-                    .map_err(|e| OxidizeError::IoError {
-                        message: format!("Failed to write JSON output: {}", e),
-                    })?;
-            }
+            self.send_batch(batches)?;
         }
         Ok(())
     }
 
-    /// Process a batch of elements in parallel
-    fn process_batch(&mut self) -> Vec<String> {
-        if self.element_queue.is_empty() {
-            return Vec::new();
+    /// Hand any remaining queued elements to the output thread
+    pub fn send_remaining(&mut self, batches: &SyncSender<Vec<String>>) -> Result<(), OxidizeError> {
+        if !self.element_queue.is_empty() {
+            self.send_batch(batches)?;
         }
-
-        let batch_size = self.batch_size.min(self.element_queue.len());
-        
-        // Process elements directly from the queue without intermediate collection
-        let batch_elements: Vec<_> = self.element_queue.drain(..batch_size).collect();
-        
-        // Process in parallel using Rayon
-        let results = batch_elements
-            .par_iter()
-            .filter_map(|xml_str| {
-                // Parse each element
-                match get_xml_node(xml_str) {
-                    Ok(node) => {
-                        // Convert XmlNode to serde_json::Value
-                        let value = node.to_json();
-                        // Serialize to string
-                        match serde_json::to_string(&value) {
-                            Ok(json) => Some(json),
-                            Err(_) => None,
-                        }
-                    }
-                    Err(_) => None,
-                }
-            })
-            .collect();
-            
-        results
+        Ok(())
     }
 
-    /// Process remaining elements
-    pub fn flush(&mut self) -> Vec<String> {
-        // Pre-allocate with remaining queue size to avoid reallocations
-        let mut all_results = Vec::with_capacity(self.element_queue.len());
-
-        while !self.element_queue.is_empty() {
-            let batch_results = self.process_batch();
-            all_results.extend(batch_results);
-        }
-
-        all_results
+    fn send_batch(&mut self, batches: &SyncSender<Vec<String>>) -> Result<(), OxidizeError> {
+        let batch = std::mem::replace(&mut self.element_queue, Vec::with_capacity(self.batch_size));
+        // The receiver only goes away when writing failed; that error is reported instead
+        batches.send(batch).map_err(|_| OxidizeError::IoError {
+            message: "JSON output stopped before parsing finished".to_string(),
+        })
     }
 
     /// Public method to queue self-closing elements (used by the main parsing function)
@@ -245,6 +228,54 @@ impl HybridStreamParser {
     }
 }
 
+/// Convert a batch of elements in parallel, write the JSON lines and return how many were written
+fn write_batch<W: Write>(batch: &[String], writer: &mut W) -> std::io::Result<usize> {
+    // Small batches are split finer so every worker gets a share; writes are coalesced by
+    // the caller's buffered writer either way, so this does not change the write size
+    let chunk_records = batch.len()
+        .div_ceil(rayon::current_num_threads() * OUTPUT_CHUNKS_PER_THREAD)
+        .clamp(1, MAX_OUTPUT_CHUNK_RECORDS);
+
+    // Process in parallel using Rayon, serializing each chunk of records straight into
+    // one byte buffer (chunks are collected in document order)
+    let chunks: Vec<(Vec<u8>, usize)> = batch
+        .par_chunks(chunk_records)
+        .map(|elements| {
+            // JSON output is roughly the size of the XML it came from
+            let mut out = Vec::with_capacity(elements.iter().map(String::len).sum());
+            let mut count = 0;
+            for xml_str in elements {
+                // Parse each element and serialize it straight into the chunk buffer
+                if let Ok(node) = get_xml_node(xml_str) {
+                    node.write_json(&mut out);
+                    out.push(b'\n');
+                    count += 1;
+                }
+            }
+            (out, count)
+        })
+        .collect();
+
+    let mut written = 0;
+    for (buf, count) in chunks {
+        writer.write_all(&buf)?;
+        written += count;
+    }
+    Ok(written)
+}
+
+/// Write every batch received, in order, returning how many records were written
+fn write_batches<W: Write>(batches: Receiver<Vec<String>>, mut writer: W) -> Result<usize, OxidizeError> {
+    let mut written = 0;
+    for batch in batches {
+        written += write_batch(&batch, &mut writer)
+            .map_err(|e| OxidizeError::IoError {
+                message: format!("Failed to write JSON output: {}", e),
+            })?;
+    }
+    Ok(written)
+}
+
 /// Sanitize and validate file paths for security
 pub fn sanitize_path(path: &str, operation: &str) -> Result<PathBuf, OxidizeError> {
     let path_buf = PathBuf::from(path);
@@ -317,30 +348,69 @@ pub fn validate_inputs(target_element: &str, batch_size: usize) -> Result<(), Ox
 }
 
 /// Stream parse file using quick_xml and process batches in parallel
-pub fn hybrid_stream_parse<R: BufRead, W: Write>(
+///
+/// Records are extracted on the calling thread while a scoped output thread converts the
+/// previous batch (in parallel) and writes it, so scanning overlaps with conversion. The
+/// hand-off holds no batches in between, bounding memory to roughly two batches.
+pub fn hybrid_stream_parse<R: BufRead, W: Write + Send>(
     reader: R,
-    mut writer: W,
+    writer: W,
     target_element: &str,
     batch_size: usize,
 ) -> Result<usize, OxidizeError> {
     // Validate inputs first
     validate_inputs(target_element, batch_size)?;
+
+    std::thread::scope(|scope| {
+        let (sender, receiver) = mpsc::sync_channel(0);
+        let output = scope.spawn(move || write_batches(receiver, writer));
+
+        // Monomorphize the scan loop on target name lengths up to 8
+        let target = target_element.as_bytes();
+        let scanned = match target.len() {
+            1 => scan_records(reader, TargetName::<1> { bytes: target }, batch_size, &sender),
+            2 => scan_records(reader, TargetName::<2> { bytes: target }, batch_size, &sender),
+            3 => scan_records(reader, TargetName::<3> { bytes: target }, batch_size, &sender),
+            4 => scan_records(reader, TargetName::<4> { bytes: target }, batch_size, &sender),
+            5 => scan_records(reader, TargetName::<5> { bytes: target }, batch_size, &sender),
+            6 => scan_records(reader, TargetName::<6> { bytes: target }, batch_size, &sender),
+            7 => scan_records(reader, TargetName::<7> { bytes: target }, batch_size, &sender),
+            8 => scan_records(reader, TargetName::<8> { bytes: target }, batch_size, &sender),
+            _ => scan_records(reader, TargetName::<0> { bytes: target }, batch_size, &sender),
+        };
+        drop(sender);
+
+        // An output error explains why scanning stopped early, so it takes precedence
+        let written = output.join().unwrap_or_else(|panic| std::panic::resume_unwind(panic))?;
+        scanned?;
+        Ok(written)
+    })
+}
+
+/// Extract target elements with quick_xml and send them to the output thread in batches
+fn scan_records<R: BufRead, const N: usize>(
+    reader: R,
+    target: TargetName<'_, N>,
+    batch_size: usize,
+    batches: &SyncSender<Vec<String>>,
+) -> Result<(), OxidizeError> {
     let mut parser = HybridStreamParser::new(batch_size);
     let mut xml_reader = Reader::from_reader(reader);
     xml_reader.trim_text(true);
+    // Comments, processing instructions and DOCTYPE declarations are skipped by quick_xml's
+    // memchr-driven scan for their closing delimiter; keep it from validating comment bodies
+    xml_reader.check_comments(false);
 
-    let mut buf = Vec::new();
+    // Event and element buffers are reused for the whole parse
+    let mut buf = Vec::with_capacity(EVENT_BUFFER_CAPACITY);
     let mut element_buf = Vec::new();
     let mut in_target = false;
     let mut depth = 0;
-    let mut total_count = 0;
-
-    let target_bytes = target_element.as_bytes();
 
     loop {
         match xml_reader.read_event_into(&mut buf) {
             Ok(Event::Start(ref e)) => {
-                if e.name().as_ref() == target_bytes {
+                if target.matches(e.name()) {
                     // Security check for target element
                     parser.validate_element_security_public(e)?;
                     parser.check_depth_public(true)?;
@@ -362,7 +432,7 @@ pub fn hybrid_stream_parse<R: BufRead, W: Write>(
                     depth -= 1;
                     parser.check_depth_public(false)?;
                     
-                    if depth == 0 && e.name().as_ref() == target_bytes {
+                    if depth == 0 && target.matches(e.name()) {
                         // Complete element found - security check size
                         if element_buf.len() > MAX_ELEMENT_SIZE {
                             return Err(OxidizeError::MemoryError {
@@ -374,24 +444,26 @@ pub fn hybrid_stream_parse<R: BufRead, W: Write>(
                         in_target = false;
 
                         // Convert to string and queue - use mem::take to avoid clone
-                        if let Ok(element_str) = String::from_utf8(std::mem::take(&mut element_buf)) {
+                        let element_len = element_buf.len();
+                        if let Ok(element_str) = into_utf8_string(std::mem::take(&mut element_buf)) {
                             parser.queue_element_public(element_str);
                         }
 
                         // Process batch if queue is full
-                        parser.process_batch_if_full(&mut writer, &mut total_count)?;
+                        parser.send_batch_if_full(batches)?;
 
-                        element_buf.clear();
+                        // Similar records follow, so start the next one at this size
+                        element_buf.reserve(element_len);
                     }
                 }
             }
             Ok(Event::Empty(ref e)) => {
-                if e.name().as_ref() == target_bytes {
+                if target.matches(e.name()) {
                     // Use optimized method for self-closing elements with security checks
                     parser.queue_self_closing_element_public(e)?;
 
                     // Process batch if queue is full
-                    parser.process_batch_if_full(&mut writer, &mut total_count)?;
+                    parser.send_batch_if_full(batches)?;
                 }
             }
             Ok(Event::Text(ref e)) => {
@@ -410,18 +482,8 @@ pub fn hybrid_stream_parse<R: BufRead, W: Write>(
         buf.clear();
     }
 
-    // Process remaining elements
-    let final_results = parser.flush();
-    total_count += final_results.len();
-
-    for json_line in final_results {
-        writeln!(writer, "{}", json_line)
-            .map_err(|e| OxidizeError::IoError {
-                message: format!("Failed to write final JSON output: {}", e),
-            })?;
-    }
-
-    Ok(total_count)
+    // Send remaining elements
+    parser.send_remaining(batches)
 }
 
 // Constants are already public above
@@ -602,4 +664,128 @@ mod tests {
         assert!(output_str.contains("\"Child\""));
         assert!(output_str.contains("\"GrandChild\""));
     }
-}
\ No newline at end of file
+
+    #[test]
+    fn test_deeply_nested_target_element() {
+        // Deep nesting inside a record is converted without recursion
+        let depth = 900;
+        let mut xml = String::from("<root><Item>");
+        for i in 0..depth {
+            xml.push_str(&format!("<L{}>", i));
+        }
+        xml.push_str("leaf");
+        for i in (0..depth).rev() {
+            xml.push_str(&format!("</L{}>", i));
+        }
+        xml.push_str("</Item></root>");
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 1);
+
+        let output_str = String::from_utf8(output).unwrap();
+        assert!(output_str.contains("\"leaf\""));
+        assert!(output_str.contains("\"L899\""));
+    }
+
+    #[test]
+    fn test_nesting_depth_limit() {
+        let depth = MAX_ELEMENT_DEPTH + 1;
+        let xml = format!("<root><Item>{}{}</Item></root>", "<a>".repeat(depth), "</a>".repeat(depth));
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert!(result.is_err());
+    }
+
+    #[test]
+    fn test_invalid_utf8_element_skipped() {
+        let xml: &[u8] = b"<root><Item>bad \xff byte</Item><Item>ok</Item></root>";
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 1);
+
+        let output_str = String::from_utf8(output).unwrap();
+        assert!(output_str.contains("ok"));
+        assert!(!output_str.contains("bad"));
+    }
+
+    #[test]
+    fn test_attribute_values_kept_raw() {
+        let xml = r#"<root><Item name="a &amp; b" note="plain"/></root>"#;
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 1);
+
+        let output_str = String::from_utf8(output).unwrap();
+        assert!(output_str.contains("\"@name\":\"a &amp; b\""));
+        assert!(output_str.contains("\"@note\":\"plain\""));
+    }
+
+    #[test]
+    fn test_target_name_matched_exactly() {
+        let xml = r#"<records><record_id>0</record_id><record>1</record><recor>x</recor><ns:record>y</ns:record><record/></records>"#;
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "record", 10);
+        assert_eq!(result.unwrap(), 2);
+
+        let output_str = String::from_utf8(output).unwrap();
+        assert_eq!(output_str, "\"1\"\nnull\n");
+    }
+
+    #[test]
+    fn test_tags_copied_verbatim() {
+        let xml = "<root><Item  id=\"1\"\n      kind='a &amp; b' id=\"2\"><V x=\"&lt;\"/></Item></root>";
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 1);
+
+        // Malformed attributes (here a duplicate) are still dropped without losing the record
+        let output_str = String::from_utf8(output).unwrap();
+        assert!(output_str.contains("\"@id\":\"1\""));
+        assert!(output_str.contains("\"@kind\":\"a &amp; b\""));
+        assert!(output_str.contains("\"@x\":\"&lt;\""));
+    }
+
+    #[test]
+    fn test_json_keys_sorted() {
+        let xml = "<root><Item z=\"q&quot;\\\" a=\"1\"><B>x</B><A>tab\there</A><B>y</B><C/></Item><Item b=\"2\" a=\"1\">t</Item></root>";
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 2);
+
+        // Repeated children keep document order within their array
+        let output_str = String::from_utf8(output).unwrap();
+        assert_eq!(
+            output_str,
+            "{\"@a\":\"1\",\"@z\":\"q&quot;\\\\\",\"A\":[\"tab\\there\"],\"B\":[\"x\",\"y\"],\"C\":[null]}\n\
+             {\"#text\":\"t\",\"@a\":\"1\",\"@b\":\"2\"}\n"
+        );
+    }
+
+    #[test]
+    fn test_doctype_pi_and_comments_skipped() {
+        let xml = r#"<?xml version="1.0"?>
+<!DOCTYPE root [ <!ELEMENT root (Item*)> <!ENTITY x "y"> ]>
+<?app-config mode="fast"?>
+<root>
+    <!-- <Item>commented out</Item> -->
+    <Item>1</Item>
+    <?app-marker?>
+    <Item>2<!-- trailing note --></Item>
+</root>"#;
+
+        let mut output = Vec::new();
+        let result = hybrid_stream_parse(Cursor::new(xml.as_bytes()), &mut output, "Item", 10);
+        assert_eq!(result.unwrap(), 2);
+
+        let output_str = String::from_utf8(output).unwrap();
+        assert!(!output_str.contains("commented out"));
+        assert!(!output_str.contains("trailing note"));
+    }
+}
@@ -1,46 +1,136 @@
 //! Python API bindings for the oxidize-xml XML parser.
 //!
 //! Provides high-level Python functions that handle different input/output combinations
-//! with proper error handling and parameter validation.
+//! with proper error handling and parameter validation. Parsing itself runs with the GIL
+//! released, so concurrent calls from Python threads proceed in parallel.
 
 use pyo3::prelude::*;
-use std::io::{BufRead, BufReader};
+use pyo3::pybacked::{PyBackedBytes, PyBackedStr};
+use memmap2::Mmap;
+#[cfg(unix)]
+use memmap2::Advice;
+use std::io::{BufReader, BufWriter, Write};
 use std::fs::File;
 use crate::io::error::OxidizeError;
 use crate::io::parser::{hybrid_stream_parse, sanitize_path, DEFAULT_BATCH_SIZE};
+use crate::io::xml_utils::into_utf8_string;
 
 // Input/output handling is now done through specific functions rather than enums
 
-/// Helper function to create a buffered reader from file path
-fn create_file_reader(path: &str) -> Result<Box<dyn BufRead>, OxidizeError> {
+// Buffer sizes for streaming file input and output. Regular input files are memory-mapped,
+// so the read buffer only serves pipes and special files, which deliver far less than this
+// per read anyway; JSON output is written a batch at a time and gets the larger buffer.
+const READ_BUFFER_SIZE: usize = 1 << 20;
+const WRITE_BUFFER_SIZE: usize = 4 << 20;
+// Smallest input file worth memory-mapping; below this, mapping setup costs more than it saves
+const MIN_MMAP_SIZE: u64 = 1 << 20;
+// Upper bound on the up-front allocation for string output
+const MAX_OUTPUT_PREALLOCATION: usize = 64 << 20;
+
+/// XML content passed from Python, borrowed from the `str` or `bytes` object without copying
+#[derive(FromPyObject)]
+pub enum XmlContent {
+    Str(PyBackedStr),
+    Bytes(PyBackedBytes),
+}
+
+impl XmlContent {
+    fn as_bytes(&self) -> &[u8] {
+        match self {
+            XmlContent::Str(s) => s.as_bytes(),
+            XmlContent::Bytes(b) => b.as_ref(),
+        }
+    }
+}
+
+/// Input file opened for parsing
+///
+/// Regular files of at least `MIN_MMAP_SIZE` bytes are memory-mapped so the parser reads
+/// straight from the page cache, and concurrent parses of the same file share those pages.
+/// Small files and anything that cannot be mapped (pipes, special files) fall back to a
+/// buffered reader.
+enum FileInput {
+    Mapped(Mmap),
+    Buffered(BufReader<File>),
+}
+
+impl FileInput {
+    /// Parse the input into `writer`, with the parser monomorphized for each input kind
+    fn parse<W: Write + Send>(&mut self, writer: W, target_element: &str, batch_size: usize) -> Result<usize, OxidizeError> {
+        match self {
+            FileInput::Mapped(mmap) => hybrid_stream_parse(&mmap[..], writer, target_element, batch_size),
+            FileInput::Buffered(reader) => hybrid_stream_parse(reader, writer, target_element, batch_size),
+        }
+    }
+
+    /// Input size in bytes when known up front (0 for pipes and special files)
+    fn len_hint(&self) -> usize {
+        match self {
+            FileInput::Mapped(mmap) => mmap.len(),
+            FileInput::Buffered(reader) => reader.get_ref().metadata()
+                .ok()
+                .filter(|meta| meta.is_file())
+                .map_or(0, |meta| usize::try_from(meta.len()).unwrap_or(usize::MAX)),
+        }
+    }
+}
+
+/// Helper function to open an input file, memory-mapping it when possible
+fn create_file_reader(path: &str) -> Result<FileInput, OxidizeError> {
     let safe_path = sanitize_path(path, "read")?;
     let file = File::open(&safe_path)
         .map_err(|e| OxidizeError::FileError {
             path: path.to_string(),
             error: format!("Cannot open input file: {}", e),
         })?;
-    Ok(Box::new(BufReader::new(file)))
-}
-
-/// Helper function to create a buffered reader from string content
-fn create_string_reader(content: &str) -> Box<dyn BufRead + '_> {
-    Box::new(std::io::Cursor::new(content.as_bytes()))
+    let mappable = file.metadata()
+        .map(|meta| meta.is_file() && meta.len() >= MIN_MMAP_SIZE)
+        .unwrap_or(false);
+    if mappable {
+        // SAFETY: the mapping is read-only and lives only for the duration of the parse.
+        // Callers open their output before mapping, so an output path naming this file
+        // truncates it before the map exists. Truncation by another process while the
+        // parse runs is still undefined behaviour, the caveat every mmap reader carries.
+        if let Ok(mmap) = unsafe { Mmap::map(&file) } {
+            // The parser reads front to back once: read ahead aggressively and let the
+            // kernel drop pages behind the scan. Purely a hint, so failure is ignored.
+            #[cfg(unix)]
+            let _ = mmap.advise(Advice::Sequential);
+            return Ok(FileInput::Mapped(mmap));
+        }
+    }
+    Ok(FileInput::Buffered(BufReader::with_capacity(READ_BUFFER_SIZE, file)))
 }
 
 /// Helper function to create a file writer
-fn create_file_writer(path: &str) -> Result<std::io::BufWriter<File>, OxidizeError> {
+fn create_file_writer(path: &str) -> Result<BufWriter<File>, OxidizeError> {
     let safe_path = sanitize_path(path, "write")?;
     let file = File::create(&safe_path)
         .map_err(|e| OxidizeError::FileError {
             path: path.to_string(),
             error: format!("Cannot create output file: {}", e),
         })?;
-    Ok(std::io::BufWriter::new(file))
+    Ok(BufWriter::with_capacity(WRITE_BUFFER_SIZE, file))
+}
+
+/// Helper function to flush a file writer, surfacing errors that dropping it would discard
+fn finish_file_writer(mut writer: BufWriter<File>) -> Result<(), OxidizeError> {
+    writer.flush()
+        .map_err(|e| OxidizeError::IoError {
+            message: format!("Failed to flush JSON output: {}", e),
+        })
+}
+
+/// Helper function to create the output buffer for string output, sized from the input
+///
+/// Newline-delimited JSON usually comes out a little larger than the XML it was parsed from.
+fn create_output_buffer(input_len: usize) -> Vec<u8> {
+    Vec::with_capacity((input_len.saturating_mul(5) / 4).min(MAX_OUTPUT_PREALLOCATION))
 }
 
 /// Helper function to convert Vec<u8> output to String with proper error handling
 fn vec_to_string(output: Vec<u8>) -> Result<String, OxidizeError> {
-    String::from_utf8(output)
+    into_utf8_string(output)
         .map_err(|e| OxidizeError::IoError {
             message: format!("Failed to convert output to UTF-8 string: {}", e),
         })
@@ -55,31 +145,35 @@ fn setup_parsing_params(target_element: &str, batch_size: Option<usize>) -> Resu
 
 /// Core parsing function for file input, file output
 fn parse_file_to_file(input_path: &str, output_path: &str, target_element: &str, batch_size: usize) -> Result<usize, OxidizeError> {
-    let reader = create_file_reader(input_path)?;
+    // Create the output first: if it names the input file, truncation happens before
+    // the input is mapped, never underneath a live mapping.
     let mut writer = create_file_writer(output_path)?;
-    hybrid_stream_parse(reader, &mut writer, target_element, batch_size)
+    let mut input = create_file_reader(input_path)?;
+    let count = input.parse(&mut writer, target_element, batch_size)?;
+    finish_file_writer(writer)?;
+    Ok(count)
 }
 
 /// Core parsing function for file input, string output
 fn parse_file_to_string(input_path: &str, target_element: &str, batch_size: usize) -> Result<String, OxidizeError> {
-    let reader = create_file_reader(input_path)?;
-    let mut output_vec = Vec::new();
-    hybrid_stream_parse(reader, &mut output_vec, target_element, batch_size)?;
+    let mut input = create_file_reader(input_path)?;
+    let mut output_vec = create_output_buffer(input.len_hint());
+    input.parse(&mut output_vec, target_element, batch_size)?;
     vec_to_string(output_vec)
 }
 
 /// Core parsing function for string input, file output  
-fn parse_string_to_file(content: &str, output_path: &str, target_element: &str, batch_size: usize) -> Result<usize, OxidizeError> {
-    let reader = create_string_reader(content);
+fn parse_string_to_file(content: &[u8], output_path: &str, target_element: &str, batch_size: usize) -> Result<usize, OxidizeError> {
     let mut writer = create_file_writer(output_path)?;
-    hybrid_stream_parse(reader, &mut writer, target_element, batch_size)
+    let count = hybrid_stream_parse(content, &mut writer, target_element, batch_size)?;
+    finish_file_writer(writer)?;
+    Ok(count)
 }
 
 /// Core parsing function for string input, string output
-fn parse_string_to_string(content: &str, target_element: &str, batch_size: usize) -> Result<String, OxidizeError> {
-    let reader = create_string_reader(content);
-    let mut output_vec = Vec::new();
-    hybrid_stream_parse(reader, &mut output_vec, target_element, batch_size)?;
+fn parse_string_to_string(content: &[u8], target_element: &str, batch_size: usize) -> Result<String, OxidizeError> {
+    let mut output_vec = create_output_buffer(content.len());
+    hybrid_stream_parse(content, &mut output_vec, target_element, batch_size)?;
     vec_to_string(output_vec)
 }
 
@@ -87,48 +181,66 @@ fn parse_string_to_string(content: &str, target_element: &str, batch_size: usize
 #[pyfunction]
 #[pyo3(signature = (input_path, target_element, output_path, batch_size=None))]
 pub fn parse_xml_file_to_json_file(
+    py: Python<'_>,
     input_path: &str,
     target_element: &str,
     output_path: &str,
     batch_size: Option<usize>,
 ) -> PyResult<usize> {
     let batch_size = setup_parsing_params(target_element, batch_size).map_err(PyErr::from)?;
-    parse_file_to_file(input_path, output_path, target_element, batch_size).map_err(PyErr::from)
+    py.allow_threads(|| parse_file_to_file(input_path, output_path, target_element, batch_size))
+        .map_err(PyErr::from)
 }
 
 /// Python-exposed function: file input -> string output
 #[pyfunction]
 #[pyo3(signature = (input_path, target_element, batch_size=None))]
 pub fn parse_xml_file_to_json_string(
+    py: Python<'_>,
     input_path: &str,
     target_element: &str,
     batch_size: Option<usize>,
 ) -> PyResult<String> {
     let batch_size = setup_parsing_params(target_element, batch_size).map_err(PyErr::from)?;
-    parse_file_to_string(input_path, target_element, batch_size).map_err(PyErr::from)
+    py.allow_threads(|| parse_file_to_string(input_path, target_element, batch_size))
+        .map_err(PyErr::from)
 }
 
 /// Python-exposed function: string input -> file output
+///
+/// `xml_content` may be a `str` or UTF-8 encoded `bytes`. It is only extracted once the
+/// other arguments have been validated.
 #[pyfunction]
 #[pyo3(signature = (xml_content, target_element, output_path, batch_size=None))]
 pub fn parse_xml_string_to_json_file(
-    xml_content: &str,
+    py: Python<'_>,
+    xml_content: &Bound<'_, PyAny>,
     target_element: &str,
     output_path: &str,
     batch_size: Option<usize>,
 ) -> PyResult<usize> {
     let batch_size = setup_parsing_params(target_element, batch_size).map_err(PyErr::from)?;
-    parse_string_to_file(xml_content, output_path, target_element, batch_size).map_err(PyErr::from)
+    let xml_content: XmlContent = xml_content.extract()?;
+    let content = xml_content.as_bytes();
+    py.allow_threads(|| parse_string_to_file(content, output_path, target_element, batch_size))
+        .map_err(PyErr::from)
 }
 
 /// Python-exposed function: string input -> string output
+///
+/// `xml_content` may be a `str` or UTF-8 encoded `bytes`. It is only extracted once the
+/// other arguments have been validated.
 #[pyfunction]
 #[pyo3(signature = (xml_content, target_element, batch_size=None))]
 pub fn parse_xml_string_to_json_string(
-    xml_content: &str,
+    py: Python<'_>,
+    xml_content: &Bound<'_, PyAny>,
     target_element: &str,
     batch_size: Option<usize>,
 ) -> PyResult<String> {
     let batch_size = setup_parsing_params(target_element, batch_size).map_err(PyErr::from)?;
-    parse_string_to_string(xml_content, target_element, batch_size).map_err(PyErr::from)
+    let xml_content: XmlContent = xml_content.extract()?;
+    let content = xml_content.as_bytes();
+    py.allow_threads(|| parse_string_to_string(content, target_element, batch_size))
+        .map_err(PyErr::from)
 }
\ No newline at end of file
@@ -11,7 +11,7 @@
 //! - **Attributes**: Prefixed with '@' to avoid conflicts with element names
 //! - **Mixed content**: Text in elements with children stored as '#text' entries
 //! - **Empty elements**: Self-closing/empty tags become null values
-//! - **Structure preservation**: Element order maintained via IndexMap
+//! - **Key order**: Object keys sorted by name; repeated elements keep document order in their array
 //! - **Namespace handling**: Prefixes kept in element names, declarations treated as attributes
 //!
 //! ## Ignored XML Features
@@ -21,30 +21,89 @@
 
 use quick_xml::reader::Reader;
 use quick_xml::events::Event;
-use serde_json::{Value, Map};
-use indexmap::IndexMap;
+use smol_str::SmolStr;
 
 // Constants for common strings to reduce allocations
 const ATTR_PREFIX: &str = "@";
 const TEXT_KEY: &str = "#text";
+// Attribute list capacity reserved when an element has attributes; most records have no more
+const ATTRIBUTE_CAPACITY: usize = 8;
 
 #[derive(Debug, Clone)]
 pub struct XmlNode {
-    pub tag: String,
-    pub attributes: IndexMap<String, String>,
+    pub tag: SmolStr,
+    /// Attributes sorted by name, the order they are written in. quick_xml rejects
+    /// duplicate names, so a plain list stands in for a map, and elements without
+    /// attributes allocate nothing.
+    pub attributes: Vec<(SmolStr, String)>,
     pub children: Vec<XmlNode>,
     pub text: Option<String>,
 }
 
 impl XmlNode {
-    pub fn new(tag: String) -> Self {
-        Self { tag, attributes: IndexMap::new(), children: Vec::new(), text: None }
+    pub fn new(tag: SmolStr) -> Self {
+        Self { tag, attributes: Vec::new(), children: Vec::new(), text: None }
     }
 
-    pub fn to_json(&self) -> Value {
+    /// Serialize the node tree as a single line of JSON appended to `out`.
+    ///
+    /// Text and names are escaped straight from the tree into the output buffer, with no
+    /// intermediate `serde_json::Value`. The tree is walked with an explicit heap-allocated
+    /// stack rather than recursion, so nesting depth is bounded by memory instead of the
+    /// (rayon worker) thread stack.
+    pub fn write_json(&self, out: &mut Vec<u8>) {
+        let mut stack: Vec<JsonFrame> = Vec::new();
+        if let Some(frame) = self.open_json(out) {
+            stack.push(frame);
+        }
+
+        while let Some(frame) = stack.last_mut() {
+            let previous = frame.next.checked_sub(1).map(|i| frame.members[i]);
+            let Some(&member) = frame.members.get(frame.next) else {
+                // All members written - close the last child group and this node's object
+                if let Some(JsonMember::Child(_)) = previous {
+                    out.push(b']');
+                }
+                out.push(b'}');
+                stack.pop();
+                continue;
+            };
+            frame.next += 1;
+
+            let JsonMember::Child(child) = member else {
+                if let Some(previous) = previous {
+                    out.extend_from_slice(previous.separator());
+                }
+                frame.node.write_json_attributes(out);
+                continue;
+            };
+            match previous {
+                Some(JsonMember::Child(previous)) if previous.tag == child.tag => out.push(b','),
+                _ => {
+                    if let Some(previous) = previous {
+                        out.extend_from_slice(previous.separator());
+                    }
+                    write_json_key(out, "", &child.tag);
+                    out.push(b'[');
+                }
+            }
+
+            // Descend into the child if it has children of its own
+            if let Some(child_frame) = child.open_json(out) {
+                stack.push(child_frame);
+            }
+        }
+    }
+
+    /// Write this node's value up to its children.
+    ///
+    /// Nodes without children are written completely and return `None`; otherwise the
+    /// object is left open and a frame for its members returned.
+    fn open_json(&self, out: &mut Vec<u8>) -> Option<JsonFrame<'_>> {
         // Handle self-closing tags with no text as null values
         if self.text.is_none() && self.children.is_empty() && self.attributes.is_empty() {
-            return Value::Null;
+            out.extend_from_slice(b"null");
+            return None;
         }
 
         // If there's text and no children, return just the text
@@ -52,81 +111,180 @@ impl XmlNode {
             let cleaned_text = text.trim();
             if !cleaned_text.is_empty() && self.children.is_empty() {
                 if self.attributes.is_empty() {
-                    return Value::String(cleaned_text.to_string());
+                    write_json_str(out, cleaned_text);
                 } else {
-                    // Has both text and attributes
-                    let mut json = Map::with_capacity(self.attributes.len() + 1);
-
-                    // Add attributes with '@' prefix
-                    for (key, value) in &self.attributes {
-                        let mut attr_key = String::with_capacity(ATTR_PREFIX.len() + key.len());
-                        attr_key.push_str(ATTR_PREFIX);
-                        attr_key.push_str(key);
-                        json.insert(attr_key, Value::String(value.clone()));
-                    }
-
-                    json.insert(TEXT_KEY.to_string(), Value::String(cleaned_text.to_string()));
-                    return Value::Object(json);
+                    // Has both text and attributes; '#text' sorts before the '@' keys
+                    out.push(b'{');
+                    write_json_key(out, "", TEXT_KEY);
+                    write_json_str(out, cleaned_text);
+                    out.push(b',');
+                    self.write_json_attributes(out);
+                    out.push(b'}');
                 }
+                return None;
             }
         }
 
-        // Pre-allocate map (which will grow as needed)
-        let mut json = Map::with_capacity(self.attributes.len());
+        out.push(b'{');
+        if self.children.is_empty() {
+            self.write_json_attributes(out);
+            out.push(b'}');
+            return None;
+        }
 
-        // Add attributes with '@' prefix
-        for (key, value) in &self.attributes {
-            let mut attr_key = String::with_capacity(ATTR_PREFIX.len() + key.len());
-            attr_key.push_str(ATTR_PREFIX);
-            attr_key.push_str(key);
-            json.insert(attr_key, Value::String(value.clone()));
+        // Keys are written sorted, as in a serde_json (BTreeMap) object. A stable sort by
+        // tag groups repeated children while keeping their document order, and the
+        // attributes, whose keys all start with '@', sort as one block at "@". Attributes
+        // go first so the usual already-sorted input is a single run for the sort.
+        let mut members = Vec::with_capacity(self.children.len() + 1);
+        if !self.attributes.is_empty() {
+            members.push(JsonMember::Attributes);
         }
+        members.extend(self.children.iter().map(JsonMember::Child));
+        members.sort_by(|a, b| a.key().cmp(b.key()));
 
-        // Group children by tag name
-        if !self.children.is_empty() {
-            let mut children_groups: IndexMap<&str, Vec<&XmlNode>> = IndexMap::new();
-            for child in &self.children {
-                children_groups.entry(child.tag.as_str()).or_insert_with(Vec::new).push(child);
-            }
+        Some(JsonFrame { node: self, members, next: 0 })
+    }
 
-            for (tag, children) in children_groups {
-                let array: Vec<Value> = children.iter().map(|child| child.to_json()).collect();
-                json.insert(tag.to_string(), Value::Array(array));
+    /// Write the attributes as comma-separated '@'-prefixed members
+    fn write_json_attributes(&self, out: &mut Vec<u8>) {
+        for (i, (key, value)) in self.attributes.iter().enumerate() {
+            if i > 0 {
+                out.push(b',');
             }
+            write_json_key(out, ATTR_PREFIX, key);
+            write_json_str(out, value);
+        }
+    }
+}
+
+/// Member of an object being written: the block of attributes or one child element
+#[derive(Clone, Copy)]
+enum JsonMember<'a> {
+    Attributes,
+    Child(&'a XmlNode),
+}
+
+impl<'a> JsonMember<'a> {
+    /// Sort key: the child's tag, or "@" for the attributes
+    fn key(&self) -> &'a str {
+        match self {
+            JsonMember::Attributes => ATTR_PREFIX,
+            JsonMember::Child(child) => &child.tag,
         }
+    }
+
+    /// What ends this member when another follows: children sit in an open array
+    fn separator(&self) -> &'static [u8] {
+        match self {
+            JsonMember::Attributes => b",",
+            JsonMember::Child(_) => b"],",
+        }
+    }
+}
+
+/// Open object on the `write_json` traversal stack
+struct JsonFrame<'a> {
+    node: &'a XmlNode,
+    // Members in key order
+    members: Vec<JsonMember<'a>>,
+    next: usize,
+}
+
+// JSON escape for each byte: 0 = copy as-is, b'u' = \u00XX, anything else = backslash + byte
+const JSON_ESCAPE: [u8; 256] = {
+    let mut table = [0u8; 256];
+    let mut i = 0;
+    while i < 0x20 {
+        table[i] = b'u';
+        i += 1;
+    }
+    table[0x08] = b'b';
+    table[0x09] = b't';
+    table[0x0a] = b'n';
+    table[0x0c] = b'f';
+    table[0x0d] = b'r';
+    table[b'"' as usize] = b'"';
+    table[b'\\' as usize] = b'\\';
+    table
+};
+const HEX_DIGITS: &[u8; 16] = b"0123456789abcdef";
+
+/// Append the JSON-escaped contents of `s` (without quotes) to `out`
+fn write_json_str_contents(out: &mut Vec<u8>, s: &str) {
+    let bytes = s.as_bytes();
+    let mut start = 0;
+    for (i, &byte) in bytes.iter().enumerate() {
+        let escape = JSON_ESCAPE[byte as usize];
+        if escape == 0 {
+            continue;
+        }
+        out.extend_from_slice(&bytes[start..i]);
+        if escape == b'u' {
+            out.extend_from_slice(b"\\u00");
+            out.push(HEX_DIGITS[(byte >> 4) as usize]);
+            out.push(HEX_DIGITS[(byte & 0xf) as usize]);
+        } else {
+            out.push(b'\\');
+            out.push(escape);
+        }
+        start = i + 1;
+    }
+    out.extend_from_slice(&bytes[start..]);
+}
+
+/// Append `s` as a JSON string literal to `out`
+fn write_json_str(out: &mut Vec<u8>, s: &str) {
+    out.push(b'"');
+    write_json_str_contents(out, s);
+    out.push(b'"');
+}
+
+/// Append an object key made of `prefix` and `name`, followed by the colon
+fn write_json_key(out: &mut Vec<u8>, prefix: &str, name: &str) {
+    out.push(b'"');
+    out.extend_from_slice(prefix.as_bytes());
+    write_json_str_contents(out, name);
+    out.extend_from_slice(b"\":");
+}
 
-        Value::Object(json)
+/// Convert a byte buffer into a `String` without copying, validating UTF-8 with SIMD
+pub fn into_utf8_string(bytes: Vec<u8>) -> Result<String, simdutf8::basic::Utf8Error> {
+    simdutf8::basic::from_utf8(&bytes)?;
+    // SAFETY: the bytes were validated as UTF-8 just above
+    Ok(unsafe { String::from_utf8_unchecked(bytes) })
+}
 
+/// Build an element or attribute name
+///
+/// Names of up to 23 bytes (nearly all of them) are stored inline by `SmolStr`, so the
+/// repeated names of a record stream cost no heap allocation.
+fn name_from_bytes(name: &[u8]) -> SmolStr {
+    match std::str::from_utf8(name) {
+        Ok(s) => SmolStr::new(s),
+        Err(_) => SmolStr::new(String::from_utf8_lossy(name)),
     }
 }
 
 fn create_node_from_event(e: &quick_xml::events::BytesStart) -> Result<XmlNode, String> {
-    // More efficient: avoid intermediate Cow allocation
-    let tag = match std::str::from_utf8(e.name().as_ref()) {
-        Ok(s) => s.to_string(),
-        Err(_) => String::from_utf8_lossy(e.name().as_ref()).into_owned(),
-    };
-    let mut node = XmlNode::new(tag);
-    let attrs = e.attributes();
-    node.attributes.reserve(attrs.size_hint().0);
-
-    for attr in attrs {
-        match attr {
-            Ok(attr) => {
-                // More efficient: avoid Cow allocations
-                let key = match std::str::from_utf8(attr.key.as_ref()) {
-                    Ok(s) => s.to_string(),
-                    Err(_) => String::from_utf8_lossy(attr.key.as_ref()).into_owned(),
-                };
-                let value = match std::str::from_utf8(&attr.value) {
-                    Ok(s) => s.to_string(),
-                    Err(_) => String::from_utf8_lossy(&attr.value).into_owned(),
-                };
-                node.attributes.insert(key, value);
-            }
-            Err(e) => return Err(e.to_string()),
-        }
+    let mut node = XmlNode::new(name_from_bytes(e.name().as_ref()));
+    // The attribute iterator cannot report a count up front, so reserve only for
+    // elements that have any attributes at all
+    if e.attributes_raw().iter().any(|b| !b.is_ascii_whitespace()) {
+        node.attributes.reserve(ATTRIBUTE_CAPACITY);
+    }
+
+    // Record markup is copied verbatim from the source document, so malformed attributes
+    // (duplicates, missing values) are skipped here rather than failing the whole record
+    for attr in e.attributes().flatten() {
+        let key = name_from_bytes(attr.key.as_ref());
+        let value = match std::str::from_utf8(&attr.value) {
+            Ok(s) => s.to_string(),
+            Err(_) => String::from_utf8_lossy(&attr.value).into_owned(),
+        };
+        node.attributes.push((key, value));
     }
+    node.attributes.sort_unstable_by(|(a, _), (b, _)| a.cmp(b));
 
     Ok(node)
 }
@@ -142,13 +300,14 @@ fn handle_completed_node(node: XmlNode, stack: &mut Vec<XmlNode>, root: &mut Opt
 }
 
 pub fn get_xml_node(xml_str: &str) -> Result<XmlNode, String> {
+    // Slice-backed reader: events borrow from xml_str (located with memchr) instead of
+    // being copied into an intermediate buffer
     let mut reader = Reader::from_str(xml_str);
-    let mut buf = Vec::new();
     let mut stack: Vec<XmlNode> = Vec::new();
     let mut root: Option<XmlNode> = None;
 
     loop {
-        match reader.read_event_into(&mut buf) {
+        match reader.read_event() {
             Ok(Event::Start(ref e)) => {
                 let node = create_node_from_event(e)?;
                 stack.push(node);
@@ -181,7 +340,6 @@ pub fn get_xml_node(xml_str: &str) -> Result<XmlNode, String> {
             Err(e) => return Err(e.to_string()),
             _ => {}
         }
-        buf.clear();
     }
 
     root.ok_or_else(|| "No root element found".to_string())
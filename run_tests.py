@@ -5,23 +5,116 @@ Test runner for oxidize-xml.
 This script helps run different types of tests and provides clear output.
 """
 
+import os
 import sys
+import json
+import hashlib
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
 
-def run_command(cmd, description):
-    """Run a command and return success status."""
+# Passing suite results, keyed by a hash of the extension module and the tests
+RESULT_CACHE_DIR = Path(".pytest_cache") / "oxidize_results"
+
+# Test support files shared by every suite
+SHARED_TEST_PATHS = [Path("tests/conftest.py"), Path("tests/fixtures")]
+
+# Environment for pytest runs; skips writing .pyc files for the test modules
+TEST_ENV = os.environ | {"PYTHONDONTWRITEBYTECODE": "1"}
+
+# Document used by the basic functionality check
+CHECK_XML = '<?xml version="1.0"?><root><item id="1">test</item></root>'
+
+# Exit codes reported by the probe process
+PROBE_IMPORT_FAILED = 2
+PROBE_PARSE_FAILED = 3
+
+# Imports the package and parses CHECK_XML in a throwaway interpreter so the
+# runner itself (and every pytest it spawns) never loads the extension
+PROBE_SCRIPT = f"""
+import sys
+try:
+    import oxidize_xml
+except ImportError as e:
+    print(e, file=sys.stderr)
+    sys.exit({PROBE_IMPORT_FAILED})
+try:
+    result = oxidize_xml.parse_xml_string_to_json_string({CHECK_XML!r}, "item")
+except Exception as e:
+    print(e, file=sys.stderr)
+    sys.exit({PROBE_PARSE_FAILED})
+sys.exit(0 if result and "test" in result else {PROBE_PARSE_FAILED})
+"""
+
+
+def _hash_path(hasher, path):
+    """Feed a file, or every file under a directory, into hasher."""
+    files = sorted(path.rglob("*")) if path.is_dir() else [path]
+    for file in files:
+        if not file.is_file() or "__pycache__" in file.parts:
+            continue
+        hasher.update(str(file).encode())
+        hasher.update(file.read_bytes())
+
+
+def suite_cache_key(cmd, suite_dir):
+    """Compute the cache key for a suite run, or None if the package cannot be found."""
+    spec = importlib.util.find_spec("oxidize_xml")
+    if spec is None or spec.origin is None:
+        return None
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update("\0".join(cmd).encode())
+    if spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            _hash_path(hasher, Path(location))
+    else:
+        _hash_path(hasher, Path(spec.origin))
+    for path in SHARED_TEST_PATHS + [Path(suite_dir)]:
+        if path.exists():
+            _hash_path(hasher, path)
+    return hasher.hexdigest()
+
+
+def run_command(cmd, description, cache_key=None, replace_process=False):
+    """Run a command and return success status.
+
+    When cache_key is given and a previous run with the same key passed,
+    the command is skipped. With replace_process the runner execs the command
+    in place of itself and never returns unless the command cannot be found.
+    """
     print(f"\n{'='*60}")
     print(f"🔄 {description}")
     print(f"{'='*60}")
+    
+    cache_file = RESULT_CACHE_DIR / f"{cache_key}.json" if cache_key else None
+    if cache_file is not None and cache_file.exists():
+        try:
+            if json.loads(cache_file.read_text()).get("passed"):
+                print(f"\n✅ {description} - CACHED PASS (no changes since last run)")
+                return True
+        except (OSError, ValueError):
+            pass
+    
     print(f"Running: {' '.join(cmd)}")
     print()
     
+    if replace_process:
+        sys.stdout.flush()
+        try:
+            os.execvpe(cmd[0], cmd, TEST_ENV)
+        except FileNotFoundError:
+            print(f"\n❌ {description} - FAILED (command not found)")
+            return False
+    
     try:
-        result = subprocess.run(cmd, check=True, capture_output=False)
+        result = subprocess.run(cmd, check=True, capture_output=False, env=TEST_ENV)
         print(f"\n✅ {description} - PASSED")
+        if cache_file is not None:
+            RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({"passed": True, "cmd": cmd}))
         return True
     except subprocess.CalledProcessError as e:
         print(f"\n❌ {description} - FAILED (exit code {e.returncode})")
@@ -31,34 +124,34 @@ def run_command(cmd, description):
         return False
 
 
-def check_package_installed():
-    """Check if the package is properly installed."""
-    try:
-        import oxidize_xml
-        print("✅ Package import successful")
-        return True
-    except ImportError as e:
-        print(f"❌ Package import failed: {e}")
+def probe_package():
+    """Check in a subprocess that the package imports and parses basic XML."""
+    probe = subprocess.run([sys.executable, "-c", PROBE_SCRIPT], capture_output=True, text=True)
+    detail = probe.stderr.strip()
+    
+    if probe.returncode == PROBE_IMPORT_FAILED:
+        print(f"❌ Package import failed: {detail}")
         print("💡 Run './build.sh' to build and install the package")
+        print("\n❌ Package not properly installed. Please run './build.sh' first.")
         return False
-
-
-def check_basic_functionality():
-    """Check if basic XML parsing functionality works."""
-    try:
-        import oxidize_xml
-        # Test basic XML parsing
-        xml_content = '<?xml version="1.0"?><root><item id="1">test</item></root>'
-        result = oxidize_xml.parse_xml_string_to_json_string(xml_content, "item")
-        if result and "test" in result:
-            print("✅ Basic XML parsing functionality working")
-            return True
+    if probe.returncode not in (0, PROBE_PARSE_FAILED):
+        # A crash (e.g. a signal) or an unexpected exception before the parse step
+        print(f"❌ Package import crashed (exit code {probe.returncode})")
+        if detail:
+            print(detail)
+        print("\n❌ Package not properly installed. Please run './build.sh' first.")
+        return False
+    print("✅ Package import successful")
+    
+    if probe.returncode != 0:
+        if detail:
+            print(f"❌ Basic functionality test failed: {detail}")
         else:
             print("❌ Basic XML parsing failed")
-            return False
-    except Exception as e:
-        print(f"❌ Basic functionality test failed: {e}")
+        print("\n❌ Basic functionality check failed. Package may not be working correctly.")
         return False
+    print("✅ Basic XML parsing functionality working")
+    return True
 
 
 def main():
@@ -71,6 +164,10 @@ def main():
     parser.add_argument("--check", action="store_true", help="Check setup without running tests")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--coverage", action="store_true", help="Run with coverage reporting")
+    parser.add_argument("--jobs", "-n", default="auto",
+                        help="Number of pytest-xdist workers (default: auto, 0 disables)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-run suites even if code and tests are unchanged since the last pass")
     
     args = parser.parse_args()
     
@@ -81,16 +178,9 @@ def main():
     print("🧪 oxidize-xml Test Runner")
     print("=" * 60)
     
-    # Check package installation
-    print("\n📦 Checking package installation...")
-    if not check_package_installed():
-        print("\n❌ Package not properly installed. Please run './build.sh' first.")
-        return 1
-    
-    # Check basic functionality
-    print("\n🔧 Checking basic functionality...")
-    if not check_basic_functionality():
-        print("\n❌ Basic functionality check failed. Package may not be working correctly.")
+    # Check package installation and basic functionality
+    print("\n📦 Checking package installation and basic functionality...")
+    if not probe_package():
         return 1
     
     if args.check:
@@ -98,44 +188,68 @@ def main():
         return 0
     
     # Build pytest command
-    pytest_args = ["python", "-m", "pytest"]
+    pytest_args = [sys.executable, "-m", "pytest"]
     
     if args.verbose:
         pytest_args.append("-v")
     else:
         pytest_args.append("-q")
     
-    # Add coverage if requested
+    # Add coverage if requested, otherwise skip loading the plugin
     if args.coverage:
         pytest_args.extend(["--cov=oxidize_xml", "--cov-report=html", "--cov-report=term"])
+    else:
+        pytest_args.extend(["-p", "no:cov"])
+    
+    # Add test discovery and reporting. importlib mode avoids the sys.path
+    # insertion per test directory and the cache provider is not needed for
+    # one-shot suite runs.
+    pytest_args.extend(["--tb=short", "--no-header", "--import-mode=importlib", "-p", "no:cacheprovider"])
+    
+    # Distribute test files across pytest-xdist workers. Benchmarks are kept
+    # out of this since they need single-process timing.
+    xdist_args = ["-n", str(args.jobs), "--dist=loadfile"]
+    
+    def cache_key(cmd, suite_dir):
+        return None if args.no_cache else suite_cache_key(cmd, suite_dir)
+    
+    # With a single suite there is nothing to summarise afterwards, so pytest
+    # can replace this process. Suites that record a cached pass still run as
+    # a child so the result can be written once pytest exits.
+    single_suite = not args.all and sum(
+        [args.unit, args.integration, args.performance, args.benchmark]) == 1
     
-    # Add test discovery and reporting
-    pytest_args.extend(["--tb=short", "--no-header"])
+    def run_suite(cmd, description, key):
+        return run_command(cmd, description, key, replace_process=single_suite and key is None)
     
     success = True
     
     # Run unit tests
     if args.unit or args.all:
-        unit_cmd = pytest_args + ["tests/unit/"]
-        if not run_command(unit_cmd, "Unit Tests"):
+        unit_cmd = pytest_args + xdist_args + ["tests/unit/"]
+        if not run_suite(unit_cmd, "Unit Tests", cache_key(unit_cmd, "tests/unit/")):
             success = False
     
     # Run integration tests
     if args.integration or args.all:
-        integration_cmd = pytest_args + ["tests/integration/"]
-        if not run_command(integration_cmd, "Integration Tests"):
+        integration_cmd = pytest_args + xdist_args + ["tests/integration/"]
+        if not run_suite(integration_cmd, "Integration Tests",
+                         cache_key(integration_cmd, "tests/integration/")):
             success = False
     
     # Run performance tests
     if args.performance or args.all:
-        performance_cmd = pytest_args + ["tests/performance/", "-m", "not benchmark"]
-        if not run_command(performance_cmd, "Performance Tests"):
+        performance_cmd = pytest_args + xdist_args + ["tests/performance/", "-m", "not benchmark"]
+        if not run_suite(performance_cmd, "Performance Tests",
+                         cache_key(performance_cmd, "tests/performance/")):
             success = False
     
     # Run benchmark tests
     if args.benchmark:
-        benchmark_cmd = pytest_args + ["tests/performance/", "-m", "benchmark", "--benchmark-only"]
-        if not run_command(benchmark_cmd, "Benchmark Tests"):
+        benchmark_cmd = pytest_args + ["tests/performance/", "-m", "benchmark", "--benchmark-only",
+                                       "--benchmark-disable-gc", "--benchmark-warmup=on",
+                                       "--benchmark-min-rounds=5"]
+        if not run_suite(benchmark_cmd, "Benchmark Tests", None):
             success = False
     
     # Summary
@@ -153,6 +267,7 @@ def main():
         print("   - Run with --verbose for more details")
         print("   - Check specific test categories: --unit, --integration, --performance")
         print("   - Run './build.sh' if you see import errors")
+        print("   - Use --no-cache to force re-running suites that passed before")
         return 1
 
 
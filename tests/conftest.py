@@ -1,23 +1,16 @@
 """
 Pytest configuration and fixtures for oxidize-xml tests.
 """
+import functools
 import pytest
 import tempfile
 import os
+import shutil
+import sys
 from pathlib import Path
 
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        yield Path(tmp_dir)
-
-
-@pytest.fixture
-def sample_xml():
-    """Simple XML content for basic tests."""
-    return """<?xml version="1.0" encoding="UTF-8"?>
+SAMPLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
 <root>
     <record id="1">
         <name>John Doe</name>
@@ -30,6 +23,47 @@ def sample_xml():
         <status>inactive</status>
     </record>
 </root>"""
+SAMPLE_XML_BYTES = SAMPLE_XML.encode('utf-8')
+
+# RAM-backed temp directory used on Linux when it has room for the large fixtures
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_FREE_BYTES = 1 << 30
+
+
+def _use_shm():
+    """Whether scratch files should go to /dev/shm (Linux, TMPDIR unset, enough room)."""
+    return (
+        sys.platform.startswith("linux")
+        and "TMPDIR" not in os.environ
+        and SHM_DIR.is_dir()
+        and os.access(SHM_DIR, os.W_OK)
+        and shutil.disk_usage(SHM_DIR).free >= SHM_MIN_FREE_BYTES
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Root pytest's tmp_path directories in /dev/shm unless --basetemp was given.
+    
+    pytest clears an explicit --basetemp on every run, so each session gets its own
+    directory. pytest-xdist derives its workers' base directories from this one.
+    """
+    if config.option.basetemp is None and _use_shm():
+        basetemp = tempfile.mkdtemp(prefix="pytest-", dir=SHM_DIR)
+        config.option.basetemp = basetemp
+        config.add_cleanup(functools.partial(shutil.rmtree, basetemp, ignore_errors=True))
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    """Create a temporary directory for test files."""
+    return tmp_path
+
+
+@pytest.fixture
+def sample_xml():
+    """Simple XML content for basic tests."""
+    return SAMPLE_XML
 
 
 @pytest.fixture
@@ -82,40 +116,35 @@ def malformed_xml_samples():
     }
 
 
-@pytest.fixture
-def large_xml_generator():
-    """Generator function to create large XML files for performance testing."""
-    def generate_xml(num_records=1000, record_size='small'):
-        """
-        Generate XML with specified number of records.
-        
-        Args:
-            num_records: Number of records to generate
-            record_size: 'small', 'medium', or 'large'
-        """
-        if record_size == 'small':
-            record_template = """    <record id="{id}">
-        <name>User {id}</name>
-        <email>user{id}@example.com</email>
-    </record>"""
-        elif record_size == 'medium':
-            record_template = """    <record id="{id}" timestamp="2024-01-{day:02d}T10:00:00Z">
-        <name>User {id}</name>
-        <email>user{id}@example.com</email>
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n<root>\n'
+XML_FOOTER = b'</root>'
+
+
+# Record templates by size. They use %-interpolation on bytes and carry their
+# own trailing newline.
+_RECORD_TEMPLATES = {
+    'small': b"""    <record id="%(id)d">
+        <name>User %(id)d</name>
+        <email>user%(id)d@example.com</email>
+    </record>
+""",
+    'medium': b"""    <record id="%(id)d" timestamp="2024-01-%(day)02dT10:00:00Z">
+        <name>User %(id)d</name>
+        <email>user%(id)d@example.com</email>
         <department>Engineering</department>
         <location>New York</location>
         <status>active</status>
         <metadata>
             <created>2024-01-01</created>
-            <updated>2024-01-{day:02d}</updated>
+            <updated>2024-01-%(day)02d</updated>
         </metadata>
-    </record>"""
-        else:  # large
-            record_template = """    <record id="{id}" timestamp="2024-01-{day:02d}T10:00:00Z" version="1.0">
+    </record>
+""",
+    'large': b"""    <record id="%(id)d" timestamp="2024-01-%(day)02dT10:00:00Z" version="1.0">
         <personal>
-            <name>User {id}</name>
-            <email>user{id}@example.com</email>
-            <phone>+1-555-{phone:04d}</phone>
+            <name>User %(id)d</name>
+            <email>user%(id)d@example.com</email>
+            <phone>+1-555-%(phone)04d</phone>
         </personal>
         <professional>
             <department>Engineering</department>
@@ -134,37 +163,121 @@ def large_xml_generator():
         </permissions>
         <metadata>
             <created>2024-01-01T00:00:00Z</created>
-            <updated>2024-01-{day:02d}T10:00:00Z</updated>
+            <updated>2024-01-%(day)02dT10:00:00Z</updated>
             <notes>Auto-generated test user</notes>
         </metadata>
-    </record>"""
+    </record>
+""",
+}
+
+
+def _iter_xml_records(num_records, record_size):
+    """Yield each generated record as bytes."""
+    # Any unrecognized size falls through to 'large', as the if/elif chain did
+    record_template = _RECORD_TEMPLATES.get(record_size, _RECORD_TEMPLATES['large'])
+    for i in range(1, num_records + 1):
+        yield record_template % {b'id': i, b'day': (i % 28) + 1, b'phone': i % 10000}
+
+
+# Records submitted per writev() call, capped by the platform's iovec limit
+try:
+    WRITEV_BATCH = min(1024, os.sysconf("SC_IOV_MAX"))
+except (AttributeError, ValueError, OSError):
+    WRITEV_BATCH = 1024
+
+
+def _writev_all(fd, chunks):
+    """Write all chunks to fd with one writev() call, finishing any short write."""
+    written = os.writev(fd, chunks)
+    if written < sum(map(len, chunks)):
+        remaining = memoryview(b''.join(chunks))[written:]
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+
+
+def generate_xml_to_file(path, num_records=1000, record_size='small'):
+    """
+    Write generated XML straight to disk without building it in memory.
+    
+    Records are written in batches with vectored writes where the platform
+    supports them, falling back to a buffered file otherwise.
+    
+    Args:
+        path: Destination file path
+        num_records: Number of records to generate
+        record_size: 'small', 'medium', or 'large'
+    """
+    if not hasattr(os, 'writev'):
+        with open(path, 'wb', buffering=1 << 20) as f:
+            f.write(XML_HEADER)
+            for record in _iter_xml_records(num_records, record_size):
+                f.write(record)
+            f.write(XML_FOOTER)
+        return path
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        chunks = [XML_HEADER]
+        for record in _iter_xml_records(num_records, record_size):
+            chunks.append(record)
+            if len(chunks) >= WRITEV_BATCH:
+                _writev_all(fd, chunks)
+                chunks = []
+        chunks.append(XML_FOOTER)
+        _writev_all(fd, chunks)
+    finally:
+        os.close(fd)
+    return path
+
+
+# Distinct generated documents kept by large_xml_generator; the largest are tens of MB
+XML_CACHE_SIZE = 8
+
+
+@pytest.fixture(scope="session")
+def large_xml_generator():
+    """
+    Generator function to create large XML files for performance testing.
+    
+    Output is memoized by its arguments for the session, so tests asking for
+    the same document share one object instead of regenerating it.
+    """
+    @functools.lru_cache(maxsize=XML_CACHE_SIZE)
+    def generate_xml(num_records=1000, record_size='small', as_bytes=False):
+        """
+        Generate XML with specified number of records.
         
-        xml_parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<root>\n']
+        Args:
+            num_records: Number of records to generate
+            record_size: 'small', 'medium', or 'large'
+            as_bytes: Return the UTF-8 encoded document instead of a str
+        """
+        buf = bytearray(XML_HEADER)
         
-        for i in range(1, num_records + 1):
-            day = (i % 28) + 1
-            phone = i % 10000
-            xml_parts.append(record_template.format(id=i, day=day, phone=phone))
-            xml_parts.append('\n')
+        for record in _iter_xml_records(num_records, record_size):
+            buf += record
         
-        xml_parts.append('</root>')
-        return ''.join(xml_parts)
+        buf += XML_FOOTER
+        return bytes(buf) if as_bytes else buf.decode('utf-8')
     
     return generate_xml
 
 
 @pytest.fixture
-def xml_file(temp_dir, sample_xml):
+def xml_file(temp_dir):
     """Create a temporary XML file with sample content."""
     xml_path = temp_dir / "test.xml"
-    xml_path.write_text(sample_xml, encoding='utf-8')
+    xml_path.write_bytes(SAMPLE_XML_BYTES)
     return xml_path
 
 
-@pytest.fixture
-def large_xml_file(temp_dir, large_xml_generator):
-    """Create a large temporary XML file for performance testing."""
-    xml_path = temp_dir / "large_test.xml"
-    large_xml_content = large_xml_generator(num_records=10000, record_size='medium')
-    xml_path.write_text(large_xml_content, encoding='utf-8')
-    return xml_path
\ No newline at end of file
+@pytest.fixture(scope="session")
+def large_xml_file(tmp_path_factory):
+    """
+    Create a large temporary XML file for performance testing.
+    
+    The file is generated once per session and shared between tests, so tests
+    must treat it as read-only and copy it into their own temp_dir to modify it.
+    """
+    xml_path = tmp_path_factory.mktemp("oxidize_xml_session") / "large_test.xml"
+    return generate_xml_to_file(xml_path, num_records=10000, record_size='medium')
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 Sample XML files and content for testing.
 """
+from functools import lru_cache
 
 # Small sample XMLs for basic testing
 SIMPLE_BOOKS_XML = """<?xml version="1.0" encoding="UTF-8"?>
@@ -204,20 +205,49 @@ MALFORMED_SAMPLES = {
     'invalid_cdata': '<root><item><![CDATA[Unclosed CDATA</item></root>',
 }
 
+# UTF-8 encoded companions for tests that write samples to disk
+SIMPLE_BOOKS_XML_BYTES = SIMPLE_BOOKS_XML.encode('utf-8')
+API_RESPONSE_XML_BYTES = API_RESPONSE_XML.encode('utf-8')
+NESTED_STRUCTURE_XML_BYTES = NESTED_STRUCTURE_XML.encode('utf-8')
+MIXED_CONTENT_XML_BYTES = MIXED_CONTENT_XML.encode('utf-8')
+NAMESPACE_XML_BYTES = NAMESPACE_XML.encode('utf-8')
+CDATA_XML_BYTES = CDATA_XML.encode('utf-8')
+SELF_CLOSING_XML_BYTES = SELF_CLOSING_XML.encode('utf-8')
+UNICODE_XML_BYTES = UNICODE_XML.encode('utf-8')
+
+SAMPLES = {
+    'simple_books': SIMPLE_BOOKS_XML,
+    'api_response': API_RESPONSE_XML,
+    'nested_structure': NESTED_STRUCTURE_XML,
+    'mixed_content': MIXED_CONTENT_XML,
+    'namespace': NAMESPACE_XML,
+    'cdata': CDATA_XML,
+    'self_closing': SELF_CLOSING_XML,
+    'unicode': UNICODE_XML,
+}
+
+SAMPLES_BYTES = {
+    'simple_books': SIMPLE_BOOKS_XML_BYTES,
+    'api_response': API_RESPONSE_XML_BYTES,
+    'nested_structure': NESTED_STRUCTURE_XML_BYTES,
+    'mixed_content': MIXED_CONTENT_XML_BYTES,
+    'namespace': NAMESPACE_XML_BYTES,
+    'cdata': CDATA_XML_BYTES,
+    'self_closing': SELF_CLOSING_XML_BYTES,
+    'unicode': UNICODE_XML_BYTES,
+}
+
+@lru_cache(maxsize=None)
 def get_sample_xml(name):
     """Get a sample XML by name."""
-    samples = {
-        'simple_books': SIMPLE_BOOKS_XML,
-        'api_response': API_RESPONSE_XML,
-        'nested_structure': NESTED_STRUCTURE_XML,
-        'mixed_content': MIXED_CONTENT_XML,
-        'namespace': NAMESPACE_XML,
-        'cdata': CDATA_XML,
-        'self_closing': SELF_CLOSING_XML,
-        'unicode': UNICODE_XML,
-    }
-    return samples.get(name)
+    return SAMPLES.get(name)
+
+@lru_cache(maxsize=None)
+def get_sample_xml_bytes(name):
+    """Get a sample XML by name as UTF-8 encoded bytes."""
+    return SAMPLES_BYTES.get(name)
 
+@lru_cache(maxsize=None)
 def get_malformed_xml(name):
     """Get a malformed XML sample by name."""
-    return MALFORMED_SAMPLES.get(name)
\ No newline at end of file
+    return MALFORMED_SAMPLES.get(name)
@@ -2,15 +2,19 @@
 Integration tests for basic oxidize-xml functionality.
 """
 import pytest
-import json
 import tempfile
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+import oxidize_xml
+
 
 def test_parse_xml_file_to_json_file(xml_file, temp_dir):
     """Test file-to-file parsing functionality."""
-    import oxidize_xml
-    
     output_path = temp_dir / "output.json"
     
     # Parse XML to JSON file
@@ -26,31 +30,42 @@ def test_parse_xml_file_to_json_file(xml_file, temp_dir):
     # Verify output file exists and has content
     assert output_path.exists()
     content = output_path.read_text()
-    lines = content.strip().split('\n')
-    assert len(lines) == 2
+    assert content.count('\n') == 2
     
     # Parse first record
-    record1 = json.loads(lines[0])
+    record1 = json_loads(content.partition('\n')[0])
     assert record1["@id"] == "1"
     assert record1["name"] == ["John Doe"]
     assert record1["email"] == ["john@example.com"]
     assert record1["status"] == ["active"]
 
 
+def test_parse_xml_file_to_same_output_path(temp_dir):
+    """Test that writing output over a large (memory-mapped) input does not crash."""
+    xml_path = temp_dir / "same.xml"
+    records = "".join(f'<item id="{i}"><value>{i}</value></item>' for i in range(50000))
+    xml_path.write_text(f'<?xml version="1.0"?><root>{records}</root>')
+    assert xml_path.stat().st_size >= 1024 * 1024
+    
+    # The output file is created first, truncating the input before it is read
+    count = oxidize_xml.parse_xml_file_to_json_file(str(xml_path), "item", str(xml_path))
+    
+    assert count == 0
+    assert xml_path.read_text() == ""
+
+
 def test_parse_xml_file_to_json_string(xml_file):
     """Test file-to-string parsing functionality."""
-    import oxidize_xml
-    
     # Parse XML to JSON string
     result = oxidize_xml.parse_xml_file_to_json_string(str(xml_file), "record")
     
     # Verify result
-    lines = result.strip().split('\n')
-    assert len(lines) == 2
+    assert result.count('\n') == 2
     
     # Parse records
-    record1 = json.loads(lines[0])
-    record2 = json.loads(lines[1])
+    first, _, rest = result.partition('\n')
+    record1 = json_loads(first)
+    record2 = json_loads(rest.partition('\n')[0])
     
     assert record1["@id"] == "1"
     assert record1["name"] == ["John Doe"]
@@ -60,27 +75,32 @@ def test_parse_xml_file_to_json_string(xml_file):
 
 def test_parse_xml_string_to_json_string(sample_xml):
     """Test string-to-string parsing functionality."""
-    import oxidize_xml
-    
     # Parse XML string to JSON string
     result = oxidize_xml.parse_xml_string_to_json_string(sample_xml, "record")
     
     # Verify result
-    lines = result.strip().split('\n')
-    assert len(lines) == 2
+    assert result.count('\n') == 2
     
     # Parse records
-    record1 = json.loads(lines[0])
-    record2 = json.loads(lines[1])
+    first, _, rest = result.partition('\n')
+    record1 = json_loads(first)
+    record2 = json_loads(rest.partition('\n')[0])
     
     assert record1["@id"] == "1"
     assert record2["@id"] == "2"
 
 
+def test_parse_xml_bytes_to_json_string(sample_xml):
+    """Test that bytes input produces the same output as str input."""
+    from_str = oxidize_xml.parse_xml_string_to_json_string(sample_xml, "record")
+    from_bytes = oxidize_xml.parse_xml_string_to_json_string(sample_xml.encode("utf-8"), "record")
+    
+    assert from_bytes == from_str
+    assert from_bytes.count('\n') == 2
+
+
 def test_parse_xml_string_to_json_file(sample_xml, temp_dir):
     """Test string-to-file parsing functionality."""
-    import oxidize_xml
-    
     output_path = temp_dir / "output.json"
     
     # Parse XML string to JSON file
@@ -95,38 +115,28 @@ def test_parse_xml_string_to_json_file(sample_xml, temp_dir):
     assert output_path.exists()
     
     content = output_path.read_text()
-    lines = content.strip().split('\n')
-    assert len(lines) == 2
+    assert content.count('\n') == 2
 
 
-def test_batch_size_parameter(xml_file, temp_dir):
+@pytest.mark.parametrize("batch_size", [1, 2, 10, 100])
+def test_batch_size_parameter(xml_file, temp_dir, batch_size):
     """Test that batch_size parameter works correctly."""
-    import oxidize_xml
-    
     output_path = temp_dir / "output.json"
     
-    # Test with different batch sizes
-    for batch_size in [1, 2, 10, 100]:
-        if output_path.exists():
-            output_path.unlink()
-        
-        count = oxidize_xml.parse_xml_file_to_json_file(
-            str(xml_file), 
-            "record", 
-            str(output_path),
-            batch_size=batch_size
-        )
-        
-        assert count == 2
-        content = output_path.read_text()
-        lines = content.strip().split('\n')
-        assert len(lines) == 2
+    count = oxidize_xml.parse_xml_file_to_json_file(
+        str(xml_file), 
+        "record", 
+        str(output_path),
+        batch_size=batch_size
+    )
+    
+    assert count == 2
+    content = output_path.read_text()
+    assert content.count('\n') == 2
 
 
 def test_complex_xml_parsing(complex_xml, temp_dir):
     """Test parsing of complex XML with namespaces and nested elements."""
-    import oxidize_xml
-    
     output_path = temp_dir / "complex_output.json"
     
     # Parse complex XML
@@ -140,11 +150,10 @@ def test_complex_xml_parsing(complex_xml, temp_dir):
     
     # Verify complex structure
     content = output_path.read_text()
-    lines = content.strip().split('\n')
-    assert len(lines) == 2
+    assert content.count('\n') == 2
     
     # Parse first book
-    book1 = json.loads(lines[0])
+    book1 = json_loads(content.partition('\n')[0])
     assert book1["@id"] == "bk101"
     assert book1["@category"] == "fiction"
     assert book1["@available"] == "true"
@@ -179,8 +188,6 @@ def test_complex_xml_parsing(complex_xml, temp_dir):
 
 def test_self_closing_elements():
     """Test handling of self-closing elements."""
-    import oxidize_xml
-    
     xml_content = """<?xml version="1.0"?>
 <root>
     <item id="1" status="active"/>
@@ -189,23 +196,20 @@ def test_self_closing_elements():
 </root>"""
     
     result = oxidize_xml.parse_xml_string_to_json_string(xml_content, "item")
-    lines = result.strip().split('\n')
-    assert len(lines) == 3
+    assert result.count('\n') == 3
     
     # Self-closing elements should be null with attributes preserved
-    item1 = json.loads(lines[0])
+    item1 = json_loads(result.partition('\n')[0])
     assert item1["@id"] == "1"
     assert item1["@status"] == "active"
     
-    item3 = json.loads(lines[2])
+    item3 = json_loads(result.rstrip('\n').rpartition('\n')[2])
     assert item3["@id"] == "3"
     assert item3["name"] == ["With Content"]
 
 
 def test_cdata_handling():
     """Test CDATA section handling."""
-    import oxidize_xml
-    
     xml_content = """<?xml version="1.0"?>
 <root>
     <item id="1">
@@ -214,7 +218,7 @@ def test_cdata_handling():
 </root>"""
     
     result = oxidize_xml.parse_xml_string_to_json_string(xml_content, "item")
-    item = json.loads(result.strip())
+    item = json_loads(result.strip())
     
     assert item["@id"] == "1"
     assert "description" in item
@@ -227,8 +231,6 @@ def test_cdata_handling():
 
 def test_empty_target_element():
     """Test behavior when target element is not found."""
-    import oxidize_xml
-    
     xml_content = """<?xml version="1.0"?>
 <root>
     <other>content</other>
@@ -240,15 +242,13 @@ def test_empty_target_element():
 
 def test_special_characters_in_content():
     """Test handling of special XML characters."""
-    import oxidize_xml
-    
     xml_content = """<?xml version="1.0"?>
 <root>
     <item>Text with &lt;brackets&gt; and &amp;ampersands&apos; and &quot;quotes&quot;</item>
 </root>"""
     
     result = oxidize_xml.parse_xml_string_to_json_string(xml_content, "item")
-    item = json.loads(result.strip())
+    item = json_loads(result.strip())
     
     # Get the text content - it could be a string or dict with #text
     if isinstance(item, dict):
@@ -267,8 +267,6 @@ def test_special_characters_in_content():
 
 def test_mixed_content_handling():
     """Test handling of mixed content (text + child elements)."""
-    import oxidize_xml
-    
     xml_content = """<?xml version="1.0"?>
 <root>
     <item id="1">
@@ -279,7 +277,7 @@ def test_mixed_content_handling():
 </root>"""
     
     result = oxidize_xml.parse_xml_string_to_json_string(xml_content, "item")
-    item = json.loads(result.strip())
+    item = json_loads(result.strip())
     
     assert item["@id"] == "1"
     assert "child" in item
@@ -232,4 +232,17 @@ def test_error_message_formatting():
         
         error_msg = str(exc_info.value)
         for expected_text in expected_content:
-            assert expected_text in error_msg, f"Expected '{expected_text}' in error message: {error_msg}"
\ No newline at end of file
+            assert expected_text in error_msg, f"Expected '{expected_text}' in error message: {error_msg}"
+
+
+def test_invalid_arguments_rejected_before_content_type_check():
+    """Test that target_element and batch_size are validated before xml_content is read."""
+    import oxidize_xml
+    
+    # xml_content is not str/bytes, but the invalid target_element is reported first
+    with pytest.raises(ValueError) as exc_info:
+        oxidize_xml.parse_xml_string_to_json_string(12345, "")
+    assert "target_element cannot be empty" in str(exc_info.value)
+    
+    with pytest.raises(TypeError):
+        oxidize_xml.parse_xml_string_to_json_string(12345, "item")